@@ -3,31 +3,52 @@ import os
 import sys
 import argparse
 import json
-from alpaca_trade_api.rest import REST, APIError
-from alpaca_trade_api.common import URL
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# CLI output goes through this logger so -q/-v can gate it; main() attaches the handler.
+logger = logging.getLogger('alpaca')
+
 # --- Core Logic Functions (Return Data) ---
 
+@functools.lru_cache(maxsize=1)
 def setup_api_client():
     """
     Sets up and authenticates the Alpaca API client using environment variables.
-    Exits gracefully if keys are not found.
+    Exits gracefully if keys are not found. The client is built once per process
+    and shared by every caller.
     """
     try:
         api_key = os.environ['APCA_API_KEY_ID']
         secret_key = os.environ['APCA_API_SECRET_KEY']
         base_url = os.environ.get('APCA_API_BASE_URL', 'https://paper-api.alpaca.markets')
     except KeyError as e:
-        print(f"🔴 Critical Error: Environment variable {e} not set.")
+        logger.critical("🔴 Critical Error: Environment variable %s not set.", e)
         sys.exit(1)
-        
-    return REST(key_id=api_key, secret_key=secret_key, base_url=URL(base_url))
+
+    # Imported here rather than at module level: the SDK pulls in pandas and
+    # slows down commands like --help that never reach the API.
+    from requests.adapters import HTTPAdapter
+    from alpaca_trade_api.rest import REST
+    from alpaca_trade_api.common import URL
+
+    logger.debug("Connecting to Alpaca at %s", base_url)
+    api = REST(key_id=api_key, secret_key=secret_key, base_url=URL(base_url))
+
+    # Keep TLS connections to Alpaca alive and pooled so repeated calls skip
+    # the handshake. Retries stay with the SDK, which already handles 429s.
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    api._session.mount('https://', adapter)
+    api._session.headers['Connection'] = 'keep-alive'
+    return api
 
 def get_account_status_data(api):
     """Returns account status and key metrics as a dictionary."""
+    from alpaca_trade_api.rest import APIError
     try:
         account = api.get_account()
         return {
@@ -38,6 +59,7 @@ def get_account_status_data(api):
             "buying_power": float(account.buying_power),
             "cash": float(account.cash),
             "equity": float(account.equity),
+            "daytrade_count": account.daytrade_count,
             "pattern_day_trader": account.pattern_day_trader,
         }
     except APIError as e:
@@ -45,17 +67,20 @@ def get_account_status_data(api):
 
 def list_positions_data(api):
     """Returns all open positions as a list of dictionaries."""
+    from alpaca_trade_api.rest import APIError
     try:
-        positions = api.list_positions()
+        # Read the raw JSON list rather than api.list_positions(), which wraps
+        # every row in an Entity object only for us to unpack it again.
+        positions = api.get('/positions')
         return [
             {
-                "symbol": pos.symbol,
-                "qty": float(pos.qty),
-                "market_value": float(pos.market_value),
-                "avg_entry_price": float(pos.avg_entry_price),
-                "current_price": float(pos.current_price),
-                "unrealized_pl": float(pos.unrealized_pl),
-                "unrealized_plpc": float(pos.unrealized_plpc),
+                "symbol": pos["symbol"],
+                "qty": float(pos["qty"]),
+                "market_value": float(pos["market_value"]),
+                "avg_entry_price": float(pos["avg_entry_price"]),
+                "current_price": float(pos["current_price"]),
+                "unrealized_pl": float(pos["unrealized_pl"]),
+                "unrealized_plpc": float(pos["unrealized_plpc"]),
             }
             for pos in positions
         ]
@@ -66,38 +91,59 @@ def list_positions_data(api):
 
 def get_account_status(api, args):
     """Fetches and displays the account status and key metrics."""
-    data = get_account_status_data(api)
+    show_account_status(get_account_status_data(api))
+
+def show_account_status(data):
+    """Displays the account status returned by get_account_status_data."""
     if "error" in data:
-        print(f"🔴 API Error fetching account: {data['error']}")
-    else:
-        print("\n---\n📋 Fetching Account Status...\n---")
+        logger.error("🔴 API Error fetching account: %s", data['error'])
+    elif logger.isEnabledFor(logging.INFO):
         status = "ACTIVE" if data['status'] == 'ACTIVE' else "RESTRICTED"
-        print(f"Account Status:       {status} ({data['id']})")
-        print(f"Currency:             {data['currency']}")
-        print(f"Portfolio Value:      ${data['portfolio_value']:, .2f}")
-        print(f"Buying Power:         ${data['buying_power']:, .2f}")
-        print(f"Daytrade Count:       {data['daytrade_count']}")
-        print(f"Pattern Day Trader:   {'Yes' if data['pattern_day_trader'] else 'No'}")
+        logger.info("\n".join([
+            "\n---\n📋 Fetching Account Status...\n---",
+            f"Account Status:       {status} ({data['id']})",
+            f"Currency:             {data['currency']}",
+            f"Portfolio Value:      ${data['portfolio_value']:,.2f}",
+            f"Buying Power:         ${data['buying_power']:,.2f}",
+            f"Daytrade Count:       {data['daytrade_count']}",
+            f"Pattern Day Trader:   {'Yes' if data['pattern_day_trader'] else 'No'}",
+        ]))
+
+# One row of the positions table; the '%' spec scales unrealized_plpc to a percentage.
+POSITION_ROW_FORMAT = "{symbol:<10} {qty:<10} ${avg_entry_price:<17,.2f} ${current_price:<14,.2f} {unrealized_pl:<15,.2f} {unrealized_plpc:<15,.2%}"
 
 def list_positions(api, args):
     """Fetches and displays all open positions."""
-    data = list_positions_data(api)
+    show_positions(list_positions_data(api))
+
+def show_positions(data):
+    """Displays the open positions returned by list_positions_data."""
     if "error" in data:
-        print(f"🔴 API Error listing positions: {data['error']}")
+        logger.error("🔴 API Error listing positions: %s", data['error'])
     elif not data:
-        print("No open positions found.")
-    else:
-        print("\n---\n📊 Fetching Open Positions...\n---")
-        print(f"{'Symbol':<10} {'Qty':<10} {'Avg Entry Price':<18} {'Current Price':<15} {'P/L ($)':<15} {'P/L (%)':<15}")
-        print("-" * 90)
-        for pos in data:
-            pl_usd = f"{pos['unrealized_pl']:, .2f}"
-            pl_pct = f"{pos['unrealized_plpc'] * 100:,.2f}%"
-            print(f"{pos['symbol']:<10} {pos['qty']:<10} ${pos['avg_entry_price']:<17,.2f} ${pos['current_price']:<14,.2f} {pl_usd:<15} {pl_pct:<15}")
+        logger.info("No open positions found.")
+    elif logger.isEnabledFor(logging.INFO):
+        # Build the whole table and emit it at once instead of once per row.
+        lines = [
+            "\n---\n📊 Fetching Open Positions...\n---",
+            f"{'Symbol':<10} {'Qty':<10} {'Avg Entry Price':<18} {'Current Price':<15} {'P/L ($)':<15} {'P/L (%)':<15}",
+            "-" * 90,
+        ]
+        lines.extend(POSITION_ROW_FORMAT.format_map(pos) for pos in data)
+        logger.info("\n".join(lines))
+
+def get_combined_status(api, args):
+    """Fetches account status and open positions concurrently and displays both."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        account_future = executor.submit(get_account_status_data, api)
+        positions_future = executor.submit(list_positions_data, api)
+    show_account_status(account_future.result())
+    show_positions(positions_future.result())
 
 def place_order(api, args):
     """Places a new order with the specified parameters."""
-    print(f"\n---\n🛒 Placing Order for {args.qty} {args.symbol}...\n---")
+    from alpaca_trade_api.rest import APIError
+    logger.info("\n---\n🛒 Placing Order for %s %s...\n---", args.qty, args.symbol)
     try:
         order = api.submit_order(
             symbol=args.symbol,
@@ -106,37 +152,48 @@ def place_order(api, args):
             type=args.type,
             time_in_force=args.time_in_force
         )
-        print(f"✅ Order submitted successfully!")
-        print(f"    ID:           {order.id}")
-        print(f"    Symbol:       {order.symbol}")
-        print(f"    Qty:          {order.qty}")
-        print(f"    Side:         {order.side}")
-        print(f"    Type:         {order.type}")
-        print(f"    Status:       {order.status}")
+        logger.info(
+            "✅ Order submitted successfully!\n"
+            "    ID:           %s\n"
+            "    Symbol:       %s\n"
+            "    Qty:          %s\n"
+            "    Side:         %s\n"
+            "    Type:         %s\n"
+            "    Status:       %s",
+            order.id, order.symbol, order.qty, order.side, order.type, order.status,
+        )
     except APIError as e:
-        print(f"🔴 API Error placing order: {e}")
+        logger.error("🔴 API Error placing order: %s", e)
 
 def list_orders(api, args):
     """Lists existing orders, filtered by status."""
-    print(f"\n---\n📄 Fetching Orders (Status: {args.status})...\n---")
+    from alpaca_trade_api.rest import APIError
+    logger.info("\n---\n📄 Fetching Orders (Status: %s)...\n---", args.status)
     try:
         orders = api.list_orders(status=args.status, limit=args.limit)
         if not orders:
-            print(f"No orders found with status '{args.status}'.")
+            logger.info("No orders found with status '%s'.", args.status)
             return
-            
-        print(f"{'ID':<30} {'Symbol':<10} {'Qty':<8} {'Side':<8} {'Type':<10} {'Status':<12}")
-        print("-" * 80)
-        for order in orders:
-           print(f"{(order.id or 'N/A'):<30} {(order.symbol or 'N/A'):<10} {(order.qty or 'N/A'):<8} {(order.side or 'N/A'):<8} {(order.type or 'N/A'):<10} {(order.status or 'N/A'):<12}")
+
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                f"{'ID':<30} {'Symbol':<10} {'Qty':<8} {'Side':<8} {'Type':<10} {'Status':<12}",
+                "-" * 80,
+            ]
+            for order in orders:
+                lines.append(f"{(order.id or 'N/A'):<30} {(order.symbol or 'N/A'):<10} {(order.qty or 'N/A'):<8} {(order.side or 'N/A'):<8} {(order.type or 'N/A'):<10} {(order.status or 'N/A'):<12}")
+            logger.info("\n".join(lines))
 
     except APIError as e:
-        print(f"🔴 API Error listing orders: {e}")
+        logger.error("🔴 API Error listing orders: %s", e)
 
 
-def main():
-    """The main function to parse commands and execute them."""
+def _build_parser():
+    """Builds the argument parser for the CLI commands."""
     parser = argparse.ArgumentParser(description="A robust CLI for the Alpaca Trading API.", prog="robust_alpaca_cli")
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument('-v', '--verbose', action='store_true', help='Show debug output.')
+    verbosity.add_argument('-q', '--quiet', action='store_true', help='Only show errors.')
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     subparsers.required = True
 
@@ -148,6 +205,10 @@ def main():
     parser_positions = subparsers.add_parser('positions', help='List all open positions.')
     parser_positions.set_defaults(func=list_positions)
 
+    # 'status' command
+    parser_status = subparsers.add_parser('status', help='Get account details and open positions in one call.')
+    parser_status.set_defaults(func=get_combined_status)
+
     # 'orders' command group
     parser_orders = subparsers.add_parser('orders', help='Manage orders (list, place).')
     orders_subparsers = parser_orders.add_subparsers(dest="orders_command", help="Order actions")
@@ -168,8 +229,18 @@ def main():
     parser_orders_place.add_argument('--time_in_force', type=str, default='gtc', choices=['day', 'gtc', 'opg'], help='Time in force.')
     parser_orders_place.set_defaults(func=place_order)
 
-    args = parser.parse_args()
-    
+    return parser
+
+
+def main():
+    """The main function to parse commands and execute them."""
+    args = _build_parser().parse_args()
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO)
+
     # Setup the API client once
     api = setup_api_client()
     
@@ -1,41 +1,150 @@
 import os
-from flask import Flask, jsonify, request, render_template
-from flask_cors import CORS
+import time
+import asyncio
+import hashlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from quart import Quart, Response, request, render_template
+from quart_cors import cors
 from dotenv import load_dotenv
 
 # Import CLI logic
-from alpaca_cli import setup_api_client_from_env, get_account_status_data, list_positions_data
+from alpaca_cli import setup_api_client, get_account_status_data, list_positions_data
 
 # Load environment variables from a .env file
 load_dotenv()
 
 # Initialize Alpaca client using CLI logic
-trading_client = setup_api_client_from_env()
+trading_client = setup_api_client()
 
-app = Flask(__name__, static_folder='.')
-CORS(app)
+app = Quart(__name__, static_folder='.', template_folder='../templates')
+app = cors(app)
+
+# Threads available per worker for blocking Alpaca SDK calls.
+ALPACA_THREADS = int(os.environ.get('ALPACA_THREADS', '32'))
+
+@app.before_serving
+async def configure_executor():
+    """Sizes the default executor used by asyncio.to_thread for Alpaca calls."""
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=ALPACA_THREADS))
+
+def ojsonify(obj):
+    """Builds a JSON response using orjson, which encodes much faster than the stdlib."""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# Seconds a successful Alpaca response is served from memory before refetching.
+ACCOUNT_CACHE_TTL = 5
+POSITIONS_CACHE_TTL = 10
+
+# A fetched response, kept with its serialized body and ETag so cache hits
+# skip both the JSON encoding and the hashing.
+CachedResponse = namedtuple('CachedResponse', ['fetched_at', 'data', 'body', 'etag'])
+
+# Last good response per route.
+_response_cache = {}
+
+# Alpaca fetch currently running per route, shared by every request that
+# misses the cache while it is in flight.
+_inflight = {}
+
+async def _refresh(key, fetch):
+    """Fetches fresh data from Alpaca and caches it unless it is an error."""
+    # The Alpaca SDK is synchronous, so the call is run in a worker thread to
+    # keep the event loop free while waiting on the Alpaca round-trip.
+    data = await asyncio.to_thread(fetch, trading_client)
+    body = orjson.dumps(data)
+    if isinstance(data, dict) and "error" in data:
+        return CachedResponse(time.monotonic(), data, body, None)
+
+    etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    entry = _response_cache[key] = CachedResponse(time.monotonic(), data, body, etag)
+    return entry
+
+async def fetch_cached(key, ttl, fetch):
+    """
+    Returns (CachedResponse, cache_status) for a CLI data function, serving the
+    cached response while it is younger than `ttl`. Concurrent misses share a
+    single Alpaca call. If Alpaca fails, the last good response is served
+    instead and the status is 'STALE'.
+    """
+    entry = _response_cache.get(key)
+    if entry and time.monotonic() - entry.fetched_at < ttl:
+        return entry, 'HIT'
+
+    task = _inflight.get(key)
+    if task is None:
+        task = _inflight[key] = asyncio.ensure_future(_refresh(key, fetch))
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shielded so a disconnecting client does not cancel the fetch for the others.
+    try:
+        fresh = await asyncio.shield(task)
+    except Exception:
+        if entry:
+            return entry, 'STALE'
+        raise
+
+    if fresh.etag is None and entry:
+        return entry, 'STALE'
+    return fresh, 'MISS'
+
+def cached_json_response(entry, cache_status):
+    """
+    Builds the JSON response for a cached entry, answering 304 Not Modified
+    when the client's If-None-Match already holds the current ETag.
+    """
+    headers = {'X-Cache': cache_status}
+    if entry.etag is None:
+        return Response(entry.body, mimetype='application/json', headers=headers)
+
+    headers['ETag'] = f'"{entry.etag}"'
+    headers['Cache-Control'] = 'private, max-age=2'
+    if request.if_none_match.contains_weak(entry.etag):
+        return Response(b'', status=304, headers=headers)
+    return Response(entry.body, mimetype='application/json', headers=headers)
+
+# index.html has no template variables, so it is rendered once and the bytes reused.
+_index_html = None
 
 @app.route('/')
-def serve_index():
-    return render_template('index.html')
+async def serve_index():
+    global _index_html
+    if _index_html is None:
+        _index_html = (await render_template('index.html')).encode()
+    return Response(_index_html, mimetype='text/html')
 
 @app.route('/api/account_info', methods=['GET'])
-def get_account_info():
+async def get_account_info():
     try:
-        account_data = get_account_status_data(trading_client)
-        return jsonify(account_data), 200
+        entry, cache_status = await fetch_cached('account_info', ACCOUNT_CACHE_TTL, get_account_status_data)
+        return cached_json_response(entry, cache_status)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 @app.route('/api/positions', methods=['GET'])
-def get_positions():
+async def get_positions():
+    try:
+        entry, cache_status = await fetch_cached('positions', POSITIONS_CACHE_TTL, list_positions_data)
+        return cached_json_response(entry, cache_status)
+    except Exception as e:
+        return ojsonify({"error": str(e)}), 500
+
+@app.route('/api/dashboard', methods=['GET'])
+async def get_dashboard():
     try:
-        positions_list = list_positions_data(trading_client)
-        return jsonify(positions_list), 200
+        # Fetch account and positions concurrently so the response costs one Alpaca round-trip, not two.
+        (account, _), (positions, _) = await asyncio.gather(
+            fetch_cached('account_info', ACCOUNT_CACHE_TTL, get_account_status_data),
+            fetch_cached('positions', POSITIONS_CACHE_TTL, list_positions_data),
+        )
+        return ojsonify({"account": account.data, "positions": positions.data}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return ojsonify({"error": str(e)}), 500
 
 if __name__ == '__main__':
-    print("Starting Flask server...")
+    # Development server only; production runs through Gunicorn (see gunicorn.conf.py).
+    debug = os.environ.get('QUART_DEBUG') == '1'
+    print("Starting Quart server...")
     print("Go to http://127.0.0.1:5000 in your browser to view the client.")
-    app.run(debug=True, port=5000)
+    app.run(debug=debug, use_reloader=debug, port=5000)
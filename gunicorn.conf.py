@@ -0,0 +1,27 @@
+# gunicorn.conf.py
+# Production launcher for the web API. Run from the repository root with:
+#
+#     gunicorn
+#
+# The app is ASGI (Quart), so each worker runs an asyncio event loop through
+# the uvicorn-worker package's Uvicorn worker and keeps many Alpaca
+# round-trips in flight at once.
+import os
+
+wsgi_app = "api.api:app"
+pythonpath = "."
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+worker_class = "uvicorn_worker.UvicornWorker"
+keepalive = 5
+
+# Import the app, and build the Alpaca client, once in the master before
+# forking so workers share it copy-on-write instead of each re-running setup.
+preload_app = True
+
+
+def post_fork(server, worker):
+    """Drops any pooled Alpaca connections inherited from the master."""
+    from api.api import trading_client
+    trading_client._session.close()